@@ -9,17 +9,24 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
-from pathlib import Path
+import logging
 import os
 import dj_database_url # Keep this import
-import re # Keep re for safety if you use it elsewhere, though we won't for DB here
 from dotenv import load_dotenv
 
-# Load environment variables from a .env file at project root (if present)
-load_dotenv()
 
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+# Load environment variables from a .env file at project root (if present).
+# The sentinel lives in os.environ, so it survives a re-import of this module and is
+# inherited by the autoreloader's child process, which then skips re-parsing .env.
+if not os.environ.get("_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_DOTENV_LOADED"] = "1"
+
+# Snapshot the environment once; every setting below reads from this dict
+_ENV = dict(os.environ)
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, 'subdir').
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 # Quick-start development settings - unsuitable for production
@@ -29,7 +36,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = "django-insecure-*la-va@b(5t7)kmo+om$&0d0prlhh@qaztwr+3!26dgsa@quuv"
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = _ENV.get('DJANGO_DEBUG', '1') == '1'
 
 ALLOWED_HOSTS = ["localhost", "127.0.0.1", ".vercel.app", "your-backend-domain.com"]
 
@@ -38,17 +45,11 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1", ".vercel.app", "your-backend-domain.c
 # DATABASE CONFIGURATION (Neon/Vercel)
 # ===============================================
 
-print("=" * 60)
-print("DATABASE CONFIGURATION")
-print("=" * 60)
-
-# 1. Attempt to get the database URL. We prioritize 'DATABASE_URL' 
-DATABASE_URL = os.getenv('DATABASE_URL') 
-
-# Fallback for old variable names (just in case they are still used)
-if not DATABASE_URL:
-    DATABASE_URL = os.getenv('POSTGRES_PRISMA_URL')
+logger = logging.getLogger(__name__)
 
+# 1. Attempt to get the database URL. We prioritize 'DATABASE_URL' and
+# fall back to old variable names (just in case they are still used)
+DATABASE_URL = _ENV.get('DATABASE_URL') or _ENV.get('POSTGRES_PRISMA_URL')
 
 if not (DATABASE_URL and DATABASE_URL.strip()):
     # CRITICAL: Raise an error if the URL is missing, preventing fallbacks to SQLite.
@@ -56,49 +57,97 @@ if not (DATABASE_URL and DATABASE_URL.strip()):
         "FATAL: The 'DATABASE_URL' environment variable is not set. "
         "SQLite is not supported on Vercel. Please set the Neon connection string in Vercel Project Settings."
     )
-else:
-    try:
-        # 2. Robust URL Cleaning
-        # We must strip the query parameters (like sslmode) before passing the URL 
-        # to dj_database_url.parse() to prevent common parsing errors.
-        if '?' in DATABASE_URL:
-            # Split the string at the first '?' and take only the first part (the base URL)
-            CLEAN_DATABASE_URL = DATABASE_URL.split('?')[0]
-        else:
-            CLEAN_DATABASE_URL = DATABASE_URL
-        
-        # 3. Configure the default database connection.
-        
-        # Parse the cleaned URL into a dictionary
-        DATABASES_CONFIG = dj_database_url.parse(
-            CLEAN_DATABASE_URL,
-            conn_max_age=600,
-            ssl_require=True # CRITICAL for Vercel/Neon connection
-        )
-        
-        # Ensure the engine is explicitly set to PostgreSQL.
-        DATABASES_CONFIG['ENGINE'] = 'django.db.backends.postgresql'
-
-        DATABASES = {
-            'default': DATABASES_CONFIG
-        }
-        
-        print(f"[SUCCESS] Database engine configured: {DATABASES['default']['ENGINE']}")
 
-    except Exception as e:
-        print(f"[FATAL ERROR] Failed to parse database URL. Ensure 'dj-database-url' is installed. Error: {e}")
-        # Re-raise the error to stop the server from starting with a bad configuration
-        raise e
+try:
+    # 2. Robust URL Cleaning
+    # We must strip the query parameters (like sslmode) before passing the URL 
+    # to dj_database_url.parse() to prevent common parsing errors.
+    # partition() slices at the first '?' without building a list
+    CLEAN_DATABASE_URL = DATABASE_URL.partition('?')[0]
+    
+    # 3. Configure the default database connection.
+    
+    # Parse the cleaned URL into a dictionary
+    DATABASES_CONFIG = dj_database_url.parse(
+        CLEAN_DATABASE_URL,
+        conn_max_age=600,
+        ssl_require=True # CRITICAL for Vercel/Neon connection
+    )
+    
+    # Ensure the engine is explicitly set to PostgreSQL.
+    DATABASES_CONFIG['ENGINE'] = 'django.db.backends.postgresql'
+
+    # Transaction-mode poolers (Neon "-pooler" hosts, pgbouncer on 6543)
+    # hand out a different backend per transaction, so server-side (named)
+    # cursors must be disabled there. Keeping the client connection to the
+    # pooler open is fine, so the 600s CONN_MAX_AGE set above still applies.
+    db_host = DATABASES_CONFIG.get('HOST') or ''
+    db_port = str(DATABASES_CONFIG.get('PORT') or '')
+    if 'pooler' in db_host or 'pgbouncer' in db_host or db_port == '6543':
+        DATABASES_CONFIG['DISABLE_SERVER_SIDE_CURSORS'] = True
+    else:
+        # Short OLTP queries never recoup JIT compile time. Poolers reject the
+        # "options" startup parameter, so this is only sent on direct connections.
+        DATABASES_CONFIG.setdefault('OPTIONS', {})['options'] = '-c jit=off'
+
+    # Fail fast on unreachable hosts and detect NAT-dropped idle sockets in
+    # ~1 minute instead of the OS default of ~2 hours.
+    DATABASES_CONFIG.setdefault('OPTIONS', {}).update({
+        'connect_timeout': 10,
+        'keepalives': 1,
+        'keepalives_idle': 30,
+        'keepalives_interval': 10,
+        'keepalives_count': 3,
+    })
+
+    # Keep reads statement-scoped so pooled connections are released
+    # between statements instead of being pinned for the whole request.
+    DATABASES_CONFIG['ATOMIC_REQUESTS'] = False
+
+    DATABASES = {
+        'default': DATABASES_CONFIG
+    }
+    
+    if DEBUG:
+        logger.info("Database engine configured: %s", DATABASES['default']['ENGINE'])
+
+except Exception as e:
+    logger.error("Failed to parse database URL. Ensure 'dj-database-url' is installed. Error: %s", e)
+    # Re-raise the error to stop the server from starting with a bad configuration
+    raise e
 
 
 # ===============================================
 # END DATABASE CONFIGURATION
 # ===============================================
 
+# Google Maps responses are cached through Django's cache. The default
+# local-memory cache is per process, holds at most 300 entries and is lost
+# on exit, so on serverless deploys it rarely survives between requests.
+# Set DJANGO_CACHE_TABLE (and run "python manage.py createcachetable") to
+# share the cache across processes through the database instead. Each read
+# or write is then a query on the request's own connection; trip planning
+# batches them into one get_many before and one set_many after its
+# concurrent lookups, so the worker threads never open connections of their own.
+if _ENV.get("DJANGO_CACHE_TABLE"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": _ENV["DJANGO_CACHE_TABLE"],
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 
 # Application definition
 
-INSTALLED_APPS = [
+INSTALLED_APPS = (
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -108,9 +157,9 @@ INSTALLED_APPS = [
     "rest_framework",
     "corsheaders",
     "driver_log",
-]
+)
 
-MIDDLEWARE = [
+MIDDLEWARE = (
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -119,7 +168,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-]
+)
 
 ROOT_URLCONF = "backend.urls"
 
@@ -129,11 +178,11 @@ TEMPLATES = [
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
-            "context_processors": [
+            "context_processors": (
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
-            ],
+            ),
         },
     },
 ]
@@ -141,10 +190,24 @@ TEMPLATES = [
 WSGI_APPLICATION = "backend.wsgi.application"
 
 
+REST_FRAMEWORK = {
+    # orjson encodes/decodes the trip and route payloads several times faster than stdlib json
+    "DEFAULT_RENDERER_CLASSES": (
+        "drf_orjson_renderer.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "drf_orjson_renderer.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
-AUTH_PASSWORD_VALIDATORS = [
+AUTH_PASSWORD_VALIDATORS = (
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
     },
@@ -157,7 +220,7 @@ AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
     },
-]
+)
 
 
 # Internationalization
@@ -178,16 +241,17 @@ USE_TZ = True
 STATIC_URL = "static/"
 
 # CORS/CSRF Configuration
-# Allow all origins during development - CHANGE THIS FOR PRODUCTION
-CORS_ALLOW_ALL_ORIGINS = True
+# Only the known frontend origins are allowed; an explicit allowlist lets
+# corsheaders answer with a single membership check instead of the wildcard path.
+CORS_ALLOW_ALL_ORIGINS = False
 
-# For production, use specific origins instead:
-# CORS_ALLOWED_ORIGINS = [
-#     "http://localhost:5173",
-#     "http://127.0.0.1:5173",
-#     "https://automatedlogsheet-11cdx651c-erickmungai27-gmailcoms-projects.vercel.app",
-#     "https://your-custom-domain.com",  # Add your custom domain if you have one
-# ]
+CORS_ALLOWED_ORIGINS = (
+    "http://localhost:5173",
+    "http://127.0.0.1:5173",
+    "https://automatedlogsheet-11cdx651c-erickmungai27-gmailcoms-projects.vercel.app",
+    # Extra origins (e.g. a custom domain), comma-separated, from the environment
+    *(origin.strip() for origin in _ENV.get("DJANGO_CORS_EXTRA_ORIGINS", "").split(",") if origin.strip()),
+)
 
 # Allow credentials to be included in CORS requests
 CORS_ALLOW_CREDENTIALS = True
@@ -223,6 +287,24 @@ CSRF_TRUSTED_ORIGINS = [
     "https://your-custom-domain.com",
 ]
 
+# Logging
+# Trip planning traces are emitted at DEBUG; keep them off unless explicitly enabled.
+# Only the app logger gets a handler so django.* records aren't printed twice.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "driver_log": {
+            "handlers": ["console"],
+            "level": _ENV.get("DJANGO_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,302 @@
+"""
+Hours-of-service day planner: turns a trip's milestones into per-day duty segments.
+
+Kept free of Django models and HTTP so the scheduling loop can be exercised (and
+optimized) on its own; the view converts the returned rows into LogEntry objects.
+"""
+from collections import namedtuple
+import bisect
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# Average driving speed assumed for all HOS planning
+_DRIVING_SPEED_MPH = 55.0
+_INV_DRIVING_SPEED = 1.0 / _DRIVING_SPEED_MPH
+
+# A stop along the trip: kind ("pickup", "fuel", "dropoff"), mile marker, and stop duration in hours
+Milestone = namedtuple("Milestone", "type distance time")
+
+
+# Times of day are tracked as integer microseconds since midnight, the resolution
+# timedelta rounds to, so plain int additions give the same clock times as datetimes.
+# Entries record them truncated to whole minutes since midnight.
+_US_PER_MINUTE = 60 * 1000000
+_US_PER_HOUR = 60 * _US_PER_MINUTE
+# The duty window opens at 8:00 AM every day; the last OFF entry runs to 23:59
+_DUTY_START_MINUTE = 8 * 60
+_DUTY_START_US = _DUTY_START_MINUTE * _US_PER_MINUTE
+_END_OF_DAY_MINUTE = 23 * 60 + 59
+
+
+def schedule_days(milestones, total_distance_miles, daily_work_time, pickup_location, dropoff_location):
+    """
+    Simulate the trip day by day, driving up to daily_work_time hours a day from
+    8:00 and stopping at each milestone in turn. milestones must be sorted by
+    distance and end with the dropoff.
+
+    Returns (entries, days): (day index, duty status, start minute, end minute,
+    location text, remarks) rows in chronological order, with times as minutes since
+    midnight, and one (daily distance, cumulative distance, end mile) tuple per day.
+    The end mile is where the day's location name is looked up. Days are numbered
+    from 0; the caller maps them to calendar dates.
+    """
+    entries = []
+    # Sorted mile markers, for jumping past every already-passed milestone in one bisect
+    milestone_miles = [m.distance for m in milestones]
+    # Each stop's ON-duty entry text, worked out once so the loop indexes these
+    # instead of comparing milestone type strings on every stop
+    stop_location_texts = [pickup_location if m.type == "pickup" else "" for m in milestones]
+    stop_remarks = [
+        f"Fuel stop at {m.distance} miles" if m.type == "fuel" else f"{m.type.title()} service"
+        for m in milestones
+    ]
+    # The dropoff is always the last milestone
+    dropoff_index = len(milestones) - 1
+    
+    # Only the numbers are tracked per day; dates, hours and names are derived afterwards
+    days = []
+    total_distance_covered = 0
+    day_index = 0  # Track current day index
+    milestone_index = 0  # Track which milestone we're working towards
+    
+    # Bind what the loop touches to locals; globals and attribute lookups cost more per use
+    n_milestones = len(milestones)
+    inv_speed = _INV_DRIVING_SPEED
+    speed = _DRIVING_SPEED_MPH
+    us_per_hour = _US_PER_HOUR
+    us_per_minute = _US_PER_MINUTE
+    bisect_right = bisect.bisect_right
+    add_entry = entries.append
+    add_day = days.append
+    
+    # Checked once so disabled debug output costs nothing inside the loop
+    debug = logger.isEnabledFor(logging.DEBUG)
+    
+    # Step-by-step daily calculation
+    while total_distance_covered < total_distance_miles:
+        # Simple check: if we've reached the total distance, stop creating new days
+        if total_distance_covered >= total_distance_miles:
+            break
+            
+        # Add OFF-duty time from midnight to 8:00 AM for ALL days
+        add_entry((day_index, "OFF", 0, _DUTY_START_MINUTE, "", ""))
+        if debug:
+            logger.debug("Day %s: OFF-duty from 00:00 to 08:00", day_index + 1)
+        
+        # Start each day's duty window at 8:00 AM
+        t = _DUTY_START_US
+        
+        # Daily work time budget
+        remaining_time_today = daily_work_time
+        daily_distance_covered = 0
+        # Set when the day ends driving toward a milestone it can't reach
+        drive_rest_of_day = False
+        
+        if debug:
+            logger.debug("Day %s: Starting driving at %02d:%02d with %.2f hours available", day_index + 1, *divmod(t // us_per_minute, 60), remaining_time_today)
+            logger.debug("Current cumulative distance: %.1f miles", total_distance_covered)
+        
+        # Process milestones for this day
+        while remaining_time_today > 0 and milestone_index < n_milestones:
+            milestone = milestones[milestone_index]
+            distance_to_milestone = milestone.distance - total_distance_covered
+            
+            if distance_to_milestone <= 0:
+                # Already passed this milestone, skip it along with any others behind us
+                milestone_index = bisect_right(milestone_miles, total_distance_covered, milestone_index)
+                continue
+            
+            # Calculate time needed to reach this milestone
+            drive_time_to_milestone = distance_to_milestone * inv_speed
+            total_time_for_milestone = drive_time_to_milestone + milestone.time
+            
+            if debug:
+                logger.debug("  Milestone %s: %s at %s miles", milestone_index + 1, milestone.type, milestone.distance)
+                logger.debug("    Distance to milestone: %.1f miles", distance_to_milestone)
+                logger.debug("    Drive time: %.2f hours", drive_time_to_milestone)
+                logger.debug("    Stop time: %.2f hours", milestone.time)
+                logger.debug("    Total time needed: %.2f hours", total_time_for_milestone)
+                logger.debug("    Remaining time today: %.2f hours", remaining_time_today)
+            
+            if total_time_for_milestone <= remaining_time_today:
+                # Can complete this milestone today
+                if debug:
+                    logger.debug("    ✓ Can complete milestone today")
+                
+                # Drive to milestone
+                drive_end = t + round(drive_time_to_milestone * us_per_hour)
+                add_entry((day_index, "DR", t // us_per_minute, drive_end // us_per_minute, "", ""))
+                t = drive_end
+                daily_distance_covered += distance_to_milestone
+                total_distance_covered += distance_to_milestone
+                remaining_time_today -= drive_time_to_milestone
+                
+                # Add milestone stop
+                stop_end = t + round(milestone.time * us_per_hour)
+                reached_dropoff = milestone_index == dropoff_index
+                
+                add_entry((
+                    day_index,
+                    "ON",
+                    t // us_per_minute,
+                    stop_end // us_per_minute,
+                    stop_location_texts[milestone_index],
+                    stop_remarks[milestone_index],
+                ))
+                t = stop_end
+                remaining_time_today -= milestone.time
+                
+                if debug:
+                    logger.debug("    Completed at %02d:%02d", *divmod(t // us_per_minute, 60))
+                milestone_index += 1
+
+                # If the next milestone is at the exact same distance, process it immediately
+                # This allows pickup and fuel (or any combo) at the same mile to be logged separately
+                while (
+                    milestone_index < n_milestones
+                    and abs(milestones[milestone_index].distance - total_distance_covered) < 1e-6
+                    and remaining_time_today > 0
+                ):
+                    same_milestone = milestones[milestone_index]
+                    if debug:
+                        logger.debug("    Processing same-distance milestone: %s at %s miles", same_milestone.type, same_milestone.distance)
+                    if same_milestone.time <= remaining_time_today:
+                        same_stop_end = t + round(same_milestone.time * us_per_hour)
+                        # both pickup/dropoff and fuel are ON-duty not driving
+                        add_entry((
+                            day_index,
+                            "ON",
+                            t // us_per_minute,
+                            same_stop_end // us_per_minute,
+                            stop_location_texts[milestone_index],
+                            stop_remarks[milestone_index],
+                        ))
+                        t = same_stop_end
+                        remaining_time_today -= same_milestone.time
+                        milestone_index += 1
+                        if debug:
+                            logger.debug("    Same-distance milestone completed at %02d:%02d", *divmod(t // us_per_minute, 60))
+                    else:
+                        # Not enough time today for this same-distance stop; end day
+                        if debug:
+                            logger.debug("    Not enough time for same-distance stop today; deferring")
+                        break
+                
+                # If we completed the dropoff milestone, the trip is done
+                if reached_dropoff:
+                    if debug:
+                        logger.debug("    Trip completed! Reached dropoff at %.1f miles", total_distance_covered)
+                    # Don't add OFF-duty here - let the main loop handle it
+                    
+                    # Store final daily progress
+                    add_day((daily_distance_covered, total_distance_covered, total_distance_miles))
+                    
+                    # Break out of milestone loop
+                    remaining_time_today = 0
+                    total_distance_covered = total_distance_miles  # Set to exact total
+                    break
+                
+            else:
+                # Cannot complete milestone today, just drive for remaining time
+                if debug:
+                    logger.debug("    ✗ Cannot complete milestone today, driving for remaining time")
+                
+                # Special handling for dropoff milestone - don't exceed total distance
+                if milestone_index == dropoff_index:
+                    # Drive only as far as needed to reach dropoff
+                    distance_to_dropoff = milestone.distance - total_distance_covered
+                    if distance_to_dropoff > 0:
+                        drive_time_to_dropoff = distance_to_dropoff * inv_speed
+                        if drive_time_to_dropoff <= remaining_time_today:
+                            # Can reach dropoff today
+                            drive_end = t + round(drive_time_to_dropoff * us_per_hour)
+                            add_entry((day_index, "DR", t // us_per_minute, drive_end // us_per_minute, "", ""))
+                            t = drive_end
+                            daily_distance_covered += distance_to_dropoff
+                            total_distance_covered += distance_to_dropoff
+                            remaining_time_today -= drive_time_to_dropoff
+                            
+                            # Add dropoff service
+                            stop_end = t + round(milestone.time * us_per_hour)
+                            add_entry((
+                                day_index,
+                                "ON",
+                                t // us_per_minute,
+                                stop_end // us_per_minute,
+                                dropoff_location,
+                                "Dropoff service",
+                            ))
+                            t = stop_end
+                            remaining_time_today -= milestone.time
+                            
+                            if debug:
+                                logger.debug("    ✓ Reached dropoff at %.1f miles", total_distance_covered)
+                                logger.debug("    Trip completed! Reached dropoff at %.1f miles", total_distance_covered)
+                            
+                            # Store final daily progress
+                            add_day((daily_distance_covered, total_distance_covered, total_distance_miles))
+                            
+                            # Break out of milestone loop
+                            # Don't set remaining_time_today = 0, let main loop handle OFF-duty
+                            total_distance_covered = total_distance_miles  # Set to exact total
+                            break
+                        else:
+                            # Cannot reach dropoff today, drive for remaining time
+                            drive_rest_of_day = True
+                            break # End day
+                    else:
+                        # Already at or past dropoff
+                        if debug:
+                            logger.debug("    Already at dropoff location")
+                        break
+                else:
+                    # For other milestones, drive for remaining time
+                    drive_rest_of_day = True
+                    break # End day
+        
+        # Drive for the remaining time when the next milestone is out of reach today,
+        # or when there are no more milestones
+        if remaining_time_today > 0 and (drive_rest_of_day or milestone_index >= n_milestones):
+            distance_this_time = remaining_time_today * speed
+            drive_end = t + round(remaining_time_today * us_per_hour)
+            add_entry((day_index, "DR", t // us_per_minute, drive_end // us_per_minute, "", ""))
+            t = drive_end
+            daily_distance_covered += distance_this_time
+            total_distance_covered += distance_this_time
+            if debug:
+                logger.debug("  Drove for remaining %.2f hours: %.1f miles", remaining_time_today, distance_this_time)
+            remaining_time_today = 0
+        
+        # Check if trip is completed after milestone processing
+        if total_distance_covered >= total_distance_miles:
+            if debug:
+                logger.debug("Trip completed in milestone loop! Total distance: %.1f miles", total_distance_covered)
+            # Don't break here, let main loop add OFF-duty entry first
+        
+        # Add off-duty time for remainder of day
+        add_entry((day_index, "OFF", t // us_per_minute, _END_OF_DAY_MINUTE, "", ""))
+        
+        # Check if trip is completed after adding OFF-duty entry
+        if total_distance_covered >= total_distance_miles:
+            if debug:
+                logger.debug("Trip completed after OFF-duty entry! Total distance: %.1f miles", total_distance_covered)
+            break
+        
+        if debug:
+            logger.debug("Day %s completed: %.1f miles, cumulative: %.1f miles", day_index + 1, daily_distance_covered, total_distance_covered)
+        
+        # Store daily progress
+        add_day((daily_distance_covered, total_distance_covered, total_distance_covered))
+        
+        # Check if trip is completed
+        if total_distance_covered >= total_distance_miles:
+            if debug:
+                logger.debug("Trip completed! Total distance: %.1f miles", total_distance_covered)
+            break
+            
+        # Advance to next day
+        day_index += 1
+
+    return entries, days
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-15 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("driver_log", "0002_trip_adverse_conditions_trip_fuel_interval_miles_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(
+                fields=["trip", "log_sheet_date", "start_time"],
+                name="logentry_trip_date_idx",
+            ),
+        ),
+    ]
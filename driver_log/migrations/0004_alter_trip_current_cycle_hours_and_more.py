@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-15 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("driver_log", "0003_logentry_logentry_trip_date_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="trip",
+            name="current_cycle_hours",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AlterField(
+            model_name="logentry",
+            name="distance_driven",
+            field=models.FloatField(default=0.0),
+        ),
+    ]
@@ -1,13 +1,13 @@
+from django.conf import settings
 from django.db import models
-from django.contrib.auth import get_user_model
 
 
 class Trip(models.Model):
-    driver = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name="trips", null=True, blank=True)
+    driver = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="trips", null=True, blank=True)
     start_location = models.CharField(max_length=255)
     pickup_location = models.CharField(max_length=255, blank=True, default="")
     dropoff_location = models.CharField(max_length=255)
-    current_cycle_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    current_cycle_hours = models.FloatField(default=0.0)
     # Assumptions
     is_property_carrying = models.BooleanField(default=True)
     adverse_conditions = models.BooleanField(default=False)
@@ -22,25 +22,27 @@ class Trip(models.Model):
 
 
 class LogEntry(models.Model):
-    DUTY_CHOICES = [
-        ("OFF", "Off Duty"),
-        ("SB", "Sleeper Berth"),
-        ("DR", "Driving"),
-        ("ON", "On Duty"),
-    ]
+    class Duty(models.TextChoices):
+        OFF = "OFF", "Off Duty"
+        SB = "SB", "Sleeper Berth"
+        DR = "DR", "Driving"
+        ON = "ON", "On Duty"
 
     trip = models.ForeignKey(Trip, on_delete=models.CASCADE, related_name="log_entries")
     log_sheet_date = models.DateField()
-    duty_status = models.CharField(max_length=3, choices=DUTY_CHOICES)
+    duty_status = models.CharField(max_length=3, choices=Duty.choices)
     start_time = models.TimeField()
     end_time = models.TimeField()
     start_location_text = models.CharField(max_length=255, blank=True, default="")
     end_location_text = models.CharField(max_length=255, blank=True, default="")
-    distance_driven = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    distance_driven = models.FloatField(default=0.0)
     remarks = models.TextField(blank=True, default="")
 
     class Meta:
         ordering = ["log_sheet_date", "start_time"]
+        indexes = [
+            models.Index(fields=["trip", "log_sheet_date", "start_time"], name="logentry_trip_date_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.log_sheet_date} {self.duty_status} {self.start_time}-{self.end_time}"
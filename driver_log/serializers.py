@@ -3,9 +3,14 @@ from .models import Trip, LogEntry
 
 
 class LogEntrySerializer(serializers.ModelSerializer):
+    # Plain CharField + frozenset membership instead of ChoiceField's mapping lookup
+    _DUTY_VALUES = frozenset(LogEntry.Duty.values)
+
+    duty_status = serializers.CharField(max_length=3)
+
     class Meta:
         model = LogEntry
-        fields = [
+        fields = (
             "id",
             "trip",
             "log_sheet_date",
@@ -16,15 +21,21 @@ class LogEntrySerializer(serializers.ModelSerializer):
             "end_location_text",
             "distance_driven",
             "remarks",
-        ]
+        )
+        read_only_fields = ("id",)
+
+    def validate_duty_status(self, value):
+        if value not in self._DUTY_VALUES:
+            raise serializers.ValidationError(f'"{value}" is not a valid choice.')
+        return value
 
 
 class TripSerializer(serializers.ModelSerializer):
-    log_entries = LogEntrySerializer(many=True, read_only=True)
+    log_entries = serializers.SerializerMethodField()
 
     class Meta:
         model = Trip
-        fields = [
+        fields = (
             "id",
             "driver",
             "start_location",
@@ -39,5 +50,19 @@ class TripSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "log_entries",
-        ]
+        )
+        read_only_fields = ("id", "created_at", "updated_at")
+
+    def get_log_entries(self, obj):
+        # Trip creation passes the entries it just inserted so they aren't read back
+        entries = self.context.get("log_entries")
+        if entries is None:
+            entries = obj.log_entries.all()
+        return LogEntrySerializer(entries, many=True, context=self.context).data
+
+
+class TripListSerializer(TripSerializer):
+    """Trip listing without the (potentially large) calculated route payload."""
 
+    class Meta(TripSerializer.Meta):
+        fields = tuple(f for f in TripSerializer.Meta.fields if f != "calculated_route_json")
@@ -1,3 +1,212 @@
-from django.test import TestCase
+import threading
+from datetime import date, time
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from . import views
+from ._schedule import Milestone, schedule_days
+from .models import Trip
+
+
+class ScheduleDaysTests(SimpleTestCase):
+    def test_pickup_and_fuel_stop_at_same_mile(self):
+        milestones = [
+            Milestone("pickup", 1000.0, 1.0),
+            Milestone("fuel", 1000, 0.25),
+            Milestone("dropoff", 1200.0, 1.0),
+        ]
+        entries, days = schedule_days(milestones, 1200.0, 8.75, "Pickup", "Dropoff")
+
+        stops = [e for e in entries if e[1] == "ON"]
+        self.assertEqual(stops[0], (2, "ON", 520, 580, "Pickup", "Pickup service"))
+        # The fuel stop follows the pickup immediately, with no driving in between
+        self.assertEqual(stops[1], (2, "ON", 580, 595, "", "Fuel stop at 1000 miles"))
+        self.assertEqual(stops[2][0], 2)
+        self.assertEqual(stops[2][5], "Dropoff service")
+        self.assertEqual(days[-1], (237.5, 1200.0, 1200.0))
+
+    def test_dropoff_reached_on_later_day(self):
+        milestones = [Milestone("pickup", 100.0, 1.0), Milestone("dropoff", 600.0, 1.0)]
+        entries, days = schedule_days(milestones, 600.0, 8.75, "Pickup", "Dropoff")
+
+        self.assertEqual(entries[2], (0, "ON", 589, 649, "Pickup", "Pickup service"))
+        self.assertEqual(entries[4], (0, "OFF", 1005, 1439, "", ""))
+        self.assertEqual(entries[7][:4], (1, "ON", 669, 729))
+        self.assertEqual(entries[7][5], "Dropoff service")
+        self.assertEqual(entries[-1], (1, "OFF", 729, 1439, "", ""))
+        self.assertEqual(days, [(426.25, 426.25, 426.25), (173.75, 600.0, 600.0)])
+
+    def test_zero_distance_trip(self):
+        entries, days = schedule_days([Milestone("dropoff", 0, 1.0)], 0, 8.75, "", "Dropoff")
+
+        self.assertEqual(entries, [])
+        self.assertEqual(days, [])
+
+    def test_multi_day_trip(self):
+        milestones = [
+            Milestone("fuel", 1000, 0.25),
+            Milestone("fuel", 2000, 0.25),
+            Milestone("dropoff", 2500.0, 1.0),
+        ]
+        entries, days = schedule_days(milestones, 2500.0, 8.75, "", "Dropoff")
+
+        day_indexes = sorted({e[0] for e in entries})
+        self.assertEqual(day_indexes, list(range(len(day_indexes))))
+        self.assertGreater(len(day_indexes), 5)
+        for day_index in day_indexes:
+            day = [e for e in entries if e[0] == day_index]
+            self.assertEqual(day[0], (day_index, "OFF", 0, 480, "", ""))
+            self.assertEqual(day[-1][1], "OFF")
+            self.assertEqual(day[-1][3], 1439)
+        fuel_remarks = [e[5] for e in entries if e[5].startswith("Fuel stop")]
+        self.assertEqual(fuel_remarks, ["Fuel stop at 1000 miles", "Fuel stop at 2000 miles"])
+        self.assertAlmostEqual(days[-1][1], 2500.0)
+        self.assertAlmostEqual(sum(d[0] for d in days), 2500.0)
+
+
+@mock.patch.object(views, "GOOGLE_MAPS_API_KEY", None)
+class PlanTripTests(SimpleTestCase):
+    def plan(self, start_to_pickup, pickup_to_dropoff, **data):
+        trip = Trip(start_location="Start", pickup_location="Pickup", dropoff_location="Dropoff")
+        data.setdefault("start_date_iso", "2026-02-27")
+        with mock.patch.object(
+            views, "get_pickup_distances_batch", return_value=[start_to_pickup, pickup_to_dropoff]
+        ):
+            segments = views.plan_trip(trip, data)
+        return trip, segments
+
+    def test_pickup_and_fuel_stop_at_same_mile(self):
+        trip, segments = self.plan(1000.0, 200.0)
+
+        stops = [s for s in segments if s.duty_status == "ON"]
+        self.assertEqual([s.remarks for s in stops], ["Pickup service", "Fuel stop at 1000 miles", "Dropoff service"])
+        self.assertEqual(stops[0].end_time, stops[1].start_time)
+        self.assertEqual(stops[1].log_sheet_date, date(2026, 3, 1))
+        self.assertEqual(trip.calculated_route_json["summary"]["stops"], 1)
+
+    def test_dropoff_reached_on_later_day(self):
+        trip, segments = self.plan(100.0, 500.0)
+
+        dropoff = segments[-2]
+        self.assertEqual(dropoff.remarks, "Dropoff service")
+        self.assertEqual(dropoff.log_sheet_date, date(2026, 2, 28))
+        self.assertEqual((dropoff.start_time, dropoff.end_time), (time(11, 9), time(12, 9)))
+        progress = trip.calculated_route_json["daily_progress"]
+        self.assertEqual([p["date"] for p in progress], ["2026-02-27", "2026-02-28"])
+        self.assertEqual(progress[0]["end_location"], progress[1]["start_location"])
+
+    def test_zero_distance_trip(self):
+        trip = Trip(start_location="Start", dropoff_location="Dropoff")
+        segments = views.plan_trip(trip, {"start_date_iso": "2026-02-27"})
+
+        self.assertEqual(segments, [])
+        self.assertEqual(trip.calculated_route_json["daily_progress"], [])
+        self.assertEqual(trip.calculated_route_json["summary"]["distance"], "0 mi")
+
+    def test_multi_day_trip(self):
+        trip, segments = self.plan(500.0, 2000.0)
+
+        dates = sorted({s.log_sheet_date for s in segments})
+        self.assertEqual(dates[0], date(2026, 2, 27))
+        self.assertEqual(len(dates), 6)
+        self.assertEqual((dates[-1] - dates[0]).days, len(dates) - 1)
+        progress = trip.calculated_route_json["daily_progress"]
+        self.assertEqual(len(progress), len(dates))
+        self.assertAlmostEqual(progress[-1]["cumulative_distance"], 2500.0)
+        self.assertEqual(trip.calculated_route_json["summary"]["distance"], "2500 mi")
+        self.assertEqual(trip.calculated_route_json["summary"]["stops"], 2)
+
+
+@mock.patch.object(views, "GOOGLE_MAPS_API_KEY", "test-key")
+class MalformedMapsResponseTests(SimpleTestCase):
+    def setUp(self):
+        views._get_route_steps.cache_clear()
+        self.addCleanup(views._get_route_steps.cache_clear)
+
+    def test_distance_without_value_falls_back_to_estimate(self):
+        response = {"status": "OK", "rows": [{"elements": [{"status": "OK"}]}]}
+        with mock.patch.object(views, "_gmaps_get_json", return_value=response):
+            self.assertEqual(views.get_pickup_distances_batch([("A", "B"), ("B", "C")]), [50.0, 50.0])
+
+    def test_route_step_without_distance_falls_back_to_mile_marker(self):
+        response = {"status": "OK", "routes": [{"legs": [{"steps": [{"end_location": {"lat": 1, "lng": 2}}]}]}]}
+        with mock.patch.object(views, "_gmaps_get_json", return_value=response) as get_json:
+            name = views.get_location_name_from_route(10.0, "A", "B", "C", 100.0, 50.0)
+            views.get_location_name_from_route(10.0, "A", "B", "C", 100.0, 50.0)
+
+        self.assertEqual(name, "Location at 10.0 miles")
+        # The malformed route is not memoized, so the second lookup asks again
+        self.assertEqual(get_json.call_count, 2)
+
+
+class _RecordingCache:
+    """Dict-backed stand-in for the Django cache that records the calling threads."""
+
+    def __init__(self):
+        self.data = {}
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.threads.add(threading.get_ident())
+        self.data[key] = value
+
+    def get_many(self, keys):
+        self.threads.add(threading.get_ident())
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def set_many(self, mapping, timeout=None):
+        self.threads.add(threading.get_ident())
+        self.data.update(mapping)
+
+
+def _fake_maps_response(url, params, timeout):
+    if url == views._DISTANCE_MATRIX_URL:
+        data = {"status": "OK", "rows": [{"elements": [{"status": "OK", "distance": {"value": 800000}}]}]}
+    elif url == views._DIRECTIONS_URL:
+        steps = [{"distance": {"value": 100000}, "end_location": {"lat": i, "lng": i}} for i in range(8)]
+        data = {"status": "OK", "routes": [{"legs": [{"steps": steps}]}]}
+    else:
+        data = {"status": "OK", "results": [{"formatted_address": "Springfield, IL 62701, USA"}]}
+    return mock.Mock(json=mock.Mock(return_value=data))
+
+
+@mock.patch.object(views, "GOOGLE_MAPS_API_KEY", "test-key")
+class MapsCacheThreadingTests(SimpleTestCase):
+    def setUp(self):
+        for cached in (views._city_state_cached, views._get_route_steps, views._step_end_name):
+            cached.cache_clear()
+            self.addCleanup(cached.cache_clear)
+        views._NEG_CACHE.clear()
+        self.cache = _RecordingCache()
+        patcher = mock.patch.object(views, "cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def plan(self):
+        trip = Trip(start_location="Start", pickup_location="Pickup", dropoff_location="Dropoff")
+        views.plan_trip(trip, {"start_date_iso": "2026-02-27"})
+        return trip
+
+    def test_cache_is_only_used_from_the_request_thread(self):
+        with mock.patch.object(views._GMAPS, "get", side_effect=_fake_maps_response):
+            self.plan()
+
+        self.assertEqual(self.cache.threads, {threading.get_ident()})
+        self.assertTrue(self.cache.data)
+
+    def test_prefetched_responses_skip_the_api(self):
+        with mock.patch.object(views._GMAPS, "get", side_effect=_fake_maps_response):
+            first = self.plan()
+        for cached in (views._city_state_cached, views._get_route_steps, views._step_end_name):
+            cached.cache_clear()
+
+        with mock.patch.object(views._GMAPS, "get", side_effect=_fake_maps_response) as get:
+            second = self.plan()
+
+        self.assertEqual(get.call_count, 0)
+        self.assertEqual(second.calculated_route_json, first.calculated_route_json)
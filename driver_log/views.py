@@ -1,742 +1,635 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
 from .models import Trip, LogEntry
-from .serializers import TripSerializer, LogEntrySerializer
+from .serializers import TripSerializer, TripListSerializer, LogEntrySerializer
+from ._schedule import Milestone, schedule_days, _DRIVING_SPEED_MPH, _INV_DRIVING_SPEED
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, date, time, timedelta
+from functools import lru_cache
 from math import floor
+import bisect
+import hashlib
+import logging
+import re
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from time import monotonic
 import os
 
 
+logger = logging.getLogger(__name__)
+
+GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
+
+_DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+_DIRECTIONS_URL = "https://maps.googleapis.com/maps/api/directions/json"
+_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+_METERS_PER_MILE = 1609.34
+_MILES_PER_METER = 1.0 / _METERS_PER_MILE
+# Rows per INSERT when writing a trip's log entries; keeps statements bounded on long trips
+_LOG_ENTRY_BATCH_SIZE = 500
+# Interned time of day for every minute since midnight; every entry ending at 23:59
+# (or starting at 00:00, 08:00, ...) shares one instance instead of constructing its own
+_CLOCK_TIMES = tuple(time(minute // 60, minute % 60) for minute in range(24 * 60))
+
+# "City, ST" inside a formatted address, e.g. "Springfield, IL 62701, USA"
+_CITY_STATE_RE = re.compile(r'([^,]+),\s*([A-Z]{2})')
+
+# Shared HTTP session so Google Maps calls reuse pooled TLS connections
+# instead of paying a fresh handshake per request.
+_GMAPS = requests.Session()
+_GMAPS.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+))
+_GMAPS_TIMEOUT = (3.05, 10)
+# Google's terms allow caching Maps responses for up to 30 days
+_GMAPS_CACHE_TTL = 7 * 24 * 3600
+# Failed requests are replayed from memory for this many seconds instead of retried
+_GMAPS_NEGATIVE_TTL = 30
+# cache key -> (time.monotonic() of the failure, failed response payload)
+_NEG_CACHE: dict[str, tuple[float, dict]] = {}
+_NEG_CACHE_MAX_ENTRIES = 1024
+# Set on _gmaps_pool worker threads. Workers never touch the Django cache: with the
+# database cache each worker thread would open its own connection, which
+# request_finished never closes. They read a snapshot taken on the request thread
+# instead and leave what they fetch for the request thread to write back.
+_POOL_STATE = threading.local()
+
+
+def _remember_failure(cache_key, data):
+    """
+    Record a failed response in _NEG_CACHE, first sweeping out expired entries once
+    the map reaches _NEG_CACHE_MAX_ENTRIES so keys that are never re-read don't pile up.
+    """
+    now = monotonic()
+    if len(_NEG_CACHE) >= _NEG_CACHE_MAX_ENTRIES:
+        for key, (ts, _) in list(_NEG_CACHE.items()):
+            if now - ts >= _GMAPS_NEGATIVE_TTL:
+                _NEG_CACHE.pop(key, None)
+        if len(_NEG_CACHE) >= _NEG_CACHE_MAX_ENTRIES:
+            _NEG_CACHE.clear()
+    _NEG_CACHE[cache_key] = (now, data)
+
+
+def _gmaps_cache_key(url, params):
+    """
+    Django cache key for a Maps request; the API key is left out so rotating it
+    doesn't invalidate cached responses.
+    """
+    cache_params = sorted((k, v) for k, v in params.items() if k != 'key')
+    return "gmaps:" + hashlib.sha1(f"{url}?{cache_params}".encode()).hexdigest()
+
+
+def _init_gmaps_worker(prefetched, fetched):
+    _POOL_STATE.prefetched = prefetched
+    _POOL_STATE.fetched = fetched
+
+
+@contextmanager
+def _gmaps_pool(max_workers, cache_keys=()):
+    """
+    Thread pool for concurrent Maps lookups that keeps Django cache access on the
+    calling thread: cache_keys are read in one get_many before the workers start,
+    and the OK responses the workers fetched are written in one set_many once
+    they have finished.
+    """
+    prefetched = cache.get_many(list(cache_keys)) if cache_keys else {}
+    fetched = {}
+    with ThreadPoolExecutor(
+        max_workers=max_workers, initializer=_init_gmaps_worker, initargs=(prefetched, fetched),
+    ) as executor:
+        yield executor
+    if fetched:
+        cache.set_many(fetched, _GMAPS_CACHE_TTL)
+
+
+def _gmaps_get_json(url, params):
+    """
+    GET a Google Maps web service endpoint and return the decoded JSON, serving
+    repeated requests from the Django cache. Only OK responses are cached; failures
+    are remembered per process for a short while so callers don't hammer the API.
+    With the default local-memory cache the TTL below only holds within a single
+    process; set DJANGO_CACHE_TABLE to share cached responses across processes.
+    """
+    cache_key = _gmaps_cache_key(url, params)
+    failure = _NEG_CACHE.get(cache_key)
+    if failure is not None:
+        if monotonic() - failure[0] < _GMAPS_NEGATIVE_TTL:
+            return failure[1]
+        _NEG_CACHE.pop(cache_key, None)
+    prefetched = getattr(_POOL_STATE, 'prefetched', None)
+    if prefetched is None:
+        data = cache.get(cache_key)
+    else:
+        data = prefetched.get(cache_key) or _POOL_STATE.fetched.get(cache_key)
+    if data is None:
+        try:
+            data = _GMAPS.get(url, params=params, timeout=_GMAPS_TIMEOUT).json()
+        except (requests.RequestException, ValueError) as e:
+            _remember_failure(cache_key, {'status': 'REQUEST_FAILED', 'error_message': str(e)})
+            raise
+        if data.get('status') == 'OK':
+            if prefetched is None:
+                cache.set(cache_key, data, _GMAPS_CACHE_TTL)
+            else:
+                _POOL_STATE.fetched[cache_key] = data
+            _NEG_CACHE.pop(cache_key, None)
+        else:
+            _remember_failure(cache_key, data)
+    return data
+
+
 def get_pickup_distance_miles(start_location, pickup_location):
     """
     Calculate the distance in miles from start location to pickup location using Google Maps API
     """
     try:
-        # Get Google Maps API key from environment
-        api_key = os.getenv('GOOGLE_MAPS_API_KEY')
-        if not api_key:
-            print("No Google Maps API key found, using estimated distance")
+        if not GOOGLE_MAPS_API_KEY:
+            logger.warning("No Google Maps API key found, using estimated distance")
             return 50.0  # Default estimate
         
         # Use Google Maps Distance Matrix API
-        url = "https://maps.googleapis.com/maps/api/distancematrix/json"
         params = {
             'origins': start_location,
             'destinations': pickup_location,
-            'units': 'imperial',
-            'key': api_key
+            'key': GOOGLE_MAPS_API_KEY
         }
         
-        response = requests.get(url, params=params)
-        data = response.json()
+        data = _gmaps_get_json(_DISTANCE_MATRIX_URL, params)
         
-        if data['status'] == 'OK' and data['rows'][0]['elements'][0]['status'] == 'OK':
-            distance_text = data['rows'][0]['elements'][0]['distance']['text']
-            # Extract miles from text like "50.2 mi"
-            distance_miles = float(distance_text.replace(' mi', '').replace(',', ''))
-            print(f"Google Maps calculated distance: {distance_miles:.1f} miles")
+        rows = data.get('rows') or []
+        elements = (rows[0].get('elements') or [{}]) if rows else [{}]
+        element = elements[0]
+        # distance.value is the exact length in meters
+        distance_meters = (element.get('distance') or {}).get('value')
+        if data.get('status') == 'OK' and element.get('status') == 'OK' and distance_meters is not None:
+            distance_miles = distance_meters * _MILES_PER_METER
+            logger.debug("Google Maps calculated distance: %.1f miles", distance_miles)
             return distance_miles
         else:
-            print(f"Google Maps API error: {data}")
+            logger.warning("Google Maps API error: %s", data)
             return 50.0  # Default estimate
             
-    except Exception as e:
-        print(f"Error calculating pickup distance: {e}")
+    except (requests.RequestException, ValueError) as e:
+        logger.warning("Error calculating pickup distance: %s", e)
         return 50.0  # Default estimate
 
-def get_city_state_from_address(address, api_key):
+def get_pickup_distances_batch(pairs):
+    """
+    Calculate the distance in miles for several (origin, destination) pairs, one
+    single-pair Distance Matrix request each, issued concurrently. Returns one value
+    per pair, in order.
+    """
+    # A combined origins=A|B, destinations=B|C request would be billed for the whole
+    # N x N matrix, so each pair is requested on its own over the shared session
+    cache_keys = [
+        _gmaps_cache_key(_DISTANCE_MATRIX_URL, {'origins': origin, 'destinations': destination})
+        for origin, destination in pairs
+    ] if GOOGLE_MAPS_API_KEY else ()
+    with _gmaps_pool(max(len(pairs), 1), cache_keys) as executor:
+        return list(executor.map(lambda pair: get_pickup_distance_miles(*pair), pairs))
+
+def _extract_city_state(geocode_result):
+    """
+    Format a Geocoding API result as "City, ST", falling back to the formatted address
+    """
+    # Extract city and state from the address components
+    city = ""
+    state = ""
+    
+    for component in geocode_result.get('address_components', ()):
+        if 'locality' in component.get('types', ()):
+            city = component.get('long_name') or ""
+        elif 'administrative_area_level_1' in component.get('types', ()):
+            state = component.get('short_name') or ""
+    
+    if city and state:
+        return f"{city}, {state}"
+    
+    # Try to extract city, state from formatted address
+    formatted_address = geocode_result.get('formatted_address', '')
+    # Look for common patterns like "City, State" or "City, State ZIP"
+    match = _CITY_STATE_RE.search(formatted_address)
+    if match:
+        return f"{match.group(1).strip()}, {match.group(2)}"
+    return formatted_address
+
+@lru_cache(maxsize=4096)
+def _city_state_cached(address):
+    """
+    Geocode an address to "City, ST", memoized per process. The API key is a module
+    constant, so the address alone is the cache key. Raises ValueError on a non-OK
+    response so failures are not memoized. Across processes, the geocode response is
+    only reused when _gmaps_get_json is backed by a shared cache (DJANGO_CACHE_TABLE).
+    """
+    geocode_params = {
+        'address': address,
+        'key': GOOGLE_MAPS_API_KEY
+    }
+    
+    geocode_data = _gmaps_get_json(_GEOCODE_URL, geocode_params)
+    
+    if geocode_data.get('status') != 'OK' or not geocode_data.get('results'):
+        raise ValueError(f"Geocoding failed for {address}: {geocode_data.get('status')}")
+    return _extract_city_state(geocode_data['results'][0])
+
+def get_city_state_from_address(address):
     """
     Convert a full address to city, state format using Google Maps Geocoding API
     """
     try:
-        import requests
-        
-        geocode_url = "https://maps.googleapis.com/maps/api/geocode/json"
-        geocode_params = {
-            'address': address,
-            'key': api_key
-        }
-        
-        geocode_response = requests.get(geocode_url, params=geocode_params)
-        geocode_data = geocode_response.json()
-        
-        if geocode_data['status'] == 'OK' and geocode_data['results']:
-            result = geocode_data['results'][0]
-            city = ""
-            state = ""
-            
-            for component in result['address_components']:
-                if 'locality' in component['types']:
-                    city = component['long_name']
-                elif 'administrative_area_level_1' in component['types']:
-                    state = component['short_name']
-            
-            if city and state:
-                return f"{city}, {state}"
-            else:
-                # Try to extract city, state from formatted address
-                formatted_address = result['formatted_address']
-                import re
-                match = re.search(r'([^,]+),\s*([A-Z]{2})', formatted_address)
-                if match:
-                    return f"{match.group(1).strip()}, {match.group(2)}"
-                else:
-                    return formatted_address
-        
+        return _city_state_cached(address)
+    except (requests.RequestException, ValueError) as e:
+        logger.warning("Error converting address to city, state: %s", e)
         return address  # Fallback to original address
-        
-    except Exception as e:
-        print(f"Error converting address to city, state: {e}")
-        return address
 
-def get_location_name_from_route(distance_miles, start_location, pickup_location, dropoff_location, total_distance_miles):
+@lru_cache(maxsize=256)
+def _get_route_steps(origin, destination):
+    """
+    Fetch the Directions route from origin to destination once and return its steps
+    as two parallel tuples built in one pass: the running (prefix-sum) distance in
+    meters at the end of each step, and that step's (end_lat, end_lng).
+    Raises ValueError when no route is available so failures are not memoized.
+    """
+    params = {
+        'origin': origin,
+        'destination': destination,
+        'key': GOOGLE_MAPS_API_KEY,
+    }
+    
+    data = _gmaps_get_json(_DIRECTIONS_URL, params)
+    routes = data.get('routes') or []
+    legs = routes[0].get('legs') if routes else None
+    if data.get('status') != 'OK' or not legs:
+        raise ValueError(f"No route from {origin} to {destination}: {data.get('status')}")
+    
+    cumulative = []
+    end_points = []
+    total_meters = 0
+    for step in legs[0].get('steps') or ():
+        step_meters = (step.get('distance') or {}).get('value')
+        end_location = step.get('end_location') or {}
+        lat, lng = end_location.get('lat'), end_location.get('lng')
+        if step_meters is None or lat is None or lng is None:
+            raise ValueError(f"Malformed route step from {origin} to {destination}: {step}")
+        total_meters += step_meters
+        cumulative.append(total_meters)
+        end_points.append((lat, lng))
+    return tuple(cumulative), tuple(end_points)
+
+def _locate_on_segment(origin, destination, target_miles):
     """
-    Get the actual location name at a specific distance along the route using Google Maps API
+    Name the place target_miles along the origin -> destination route: the end of
+    the route step that reaches that distance. Names are memoized per step by
+    _step_end_name. Returns None when the target lies beyond the route.
+    """
+    cumulative, _ = _get_route_steps(origin, destination)
+    
+    # Find the first step whose cumulative distance reaches our target
+    target_distance_meters = target_miles * _METERS_PER_MILE
+    idx = bisect.bisect_left(cumulative, target_distance_meters)
+    if idx == len(cumulative):
+        return None
+    return _step_end_name(origin, destination, idx)
+
+@lru_cache(maxsize=1024)
+def _step_end_name(origin, destination, idx):
+    """
+    Reverse geocode the end of step idx of the origin -> destination route, memoized
+    per step so every mile marker falling within the same step shares one lookup.
+    Raises ValueError when reverse geocoding fails so failures are not memoized.
+    """
+    _, end_points = _get_route_steps(origin, destination)
+    lat, lng = end_points[idx]
+    
+    # Use reverse geocoding to get the address
+    geocode_params = {
+        'latlng': f"{lat},{lng}",
+        'key': GOOGLE_MAPS_API_KEY
+    }
+    
+    geocode_data = _gmaps_get_json(_GEOCODE_URL, geocode_params)
+    
+    if geocode_data.get('status') != 'OK' or not geocode_data.get('results'):
+        raise ValueError(f"Reverse geocoding failed for {lat},{lng}: {geocode_data.get('status')}")
+    
+    return _extract_city_state(geocode_data['results'][0])
+
+def get_location_name_from_route(distance_miles, start_location, pickup_location, dropoff_location, total_distance_miles, start_to_pickup_miles):
+    """
+    Get the actual location name at a specific distance along the route using Google Maps API.
+    start_to_pickup_miles is the already-known length of the A->B segment.
     """
     try:
-        # Get Google Maps API key from environment
-        api_key = os.getenv('GOOGLE_MAPS_API_KEY')
-        if not api_key:
+        if not GOOGLE_MAPS_API_KEY:
             return f"Location at {distance_miles:.1f} miles"
         
         # Calculate which segment of the route we're in
         if distance_miles <= 0:
             # Process start location to get city, state format
-            return get_city_state_from_address(start_location, api_key)
+            return get_city_state_from_address(start_location)
         elif distance_miles >= total_distance_miles:
             # Process dropoff location to get city, state format
-            return get_city_state_from_address(dropoff_location, api_key)
+            return get_city_state_from_address(dropoff_location)
         
         # Determine if we're on the A->B segment (to pickup) or B->C segment (pickup to dropoff)
-        start_to_pickup_miles = get_pickup_distance_miles(start_location, pickup_location)
-        
         if distance_miles <= start_to_pickup_miles:
-            # We're on the A->B segment (start to pickup)
-            # Use Google Maps Directions API to get waypoints along the route
-            import requests
-            
-            url = "https://maps.googleapis.com/maps/api/directions/json"
-            params = {
-                'origin': start_location,
-                'destination': pickup_location,
-                'key': api_key,
-            }
-            
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            if data['status'] == 'OK' and data['routes']:
-                route = data['routes'][0]
-                legs = route['legs']
-                
-                # Calculate total distance of the leg
-                leg_distance = 0
-                for step in legs[0]['steps']:
-                    leg_distance += step['distance']['value']  # distance in meters
-                
-                # Find the step that contains our target distance
-                target_distance_meters = distance_miles * 1609.34  # convert miles to meters
-                current_distance = 0
-                
-                for step in legs[0]['steps']:
-                    step_distance = step['distance']['value']
-                    if current_distance + step_distance >= target_distance_meters:
-                        # We found the step containing our target distance
-                        # Get the end location of this step
-                        end_location = step['end_location']
-                        
-                        # Use reverse geocoding to get the address
-                        geocode_url = "https://maps.googleapis.com/maps/api/geocode/json"
-                        geocode_params = {
-                            'latlng': f"{end_location['lat']},{end_location['lng']}",
-                            'key': api_key
-                        }
-                        
-                        geocode_response = requests.get(geocode_url, params=geocode_params)
-                        geocode_data = geocode_response.json()
-                        
-                        if geocode_data['status'] == 'OK' and geocode_data['results']:
-                            result = geocode_data['results'][0]
-                            # Extract city and state from the address components
-                            city = ""
-                            state = ""
-                            
-                            for component in result['address_components']:
-                                if 'locality' in component['types']:
-                                    city = component['long_name']
-                                elif 'administrative_area_level_1' in component['types']:
-                                    state = component['short_name']
-                            
-                            if city and state:
-                                return f"{city}, {state}"
-                            else:
-                                # Try to extract city, state from formatted address
-                                formatted_address = result['formatted_address']
-                                # Look for common patterns like "City, State" or "City, State ZIP"
-                                import re
-                                match = re.search(r'([^,]+),\s*([A-Z]{2})', formatted_address)
-                                if match:
-                                    return f"{match.group(1).strip()}, {match.group(2)}"
-                                else:
-                                    return formatted_address
-                        
-                        break
-                    current_distance += step_distance
+            location_name = _locate_on_segment(start_location, pickup_location, distance_miles)
         else:
-            # We're on the B->C segment (pickup to dropoff)
-            # Calculate the percentage along this segment
-            segment_distance = distance_miles - start_to_pickup_miles
-            pickup_to_dropoff_miles = get_pickup_distance_miles(pickup_location, dropoff_location)
-            
-            # Use similar logic for the pickup to dropoff segment
-            import requests
-            
-            url = "https://maps.googleapis.com/maps/api/directions/json"
-            params = {
-                'origin': pickup_location,
-                'destination': dropoff_location,
-                'key': api_key,
-            }
-            
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            if data['status'] == 'OK' and data['routes']:
-                route = data['routes'][0]
-                legs = route['legs']
-                
-                # Calculate total distance of the leg
-                leg_distance = 0
-                for step in legs[0]['steps']:
-                    leg_distance += step['distance']['value']
-                
-                # Find the step that contains our target distance
-                target_distance_meters = segment_distance * 1609.34
-                current_distance = 0
-                
-                for step in legs[0]['steps']:
-                    step_distance = step['distance']['value']
-                    if current_distance + step_distance >= target_distance_meters:
-                        end_location = step['end_location']
-                        
-                        # Use reverse geocoding
-                        geocode_url = "https://maps.googleapis.com/maps/api/geocode/json"
-                        geocode_params = {
-                            'latlng': f"{end_location['lat']},{end_location['lng']}",
-                            'key': api_key
-                        }
-                        
-                        geocode_response = requests.get(geocode_url, params=geocode_params)
-                        geocode_data = geocode_response.json()
-                        
-                        if geocode_data['status'] == 'OK' and geocode_data['results']:
-                            result = geocode_data['results'][0]
-                            city = ""
-                            state = ""
-                            
-                            for component in result['address_components']:
-                                if 'locality' in component['types']:
-                                    city = component['long_name']
-                                elif 'administrative_area_level_1' in component['types']:
-                                    state = component['short_name']
-                            
-                            if city and state:
-                                return f"{city}, {state}"
-                            else:
-                                # Try to extract city, state from formatted address
-                                formatted_address = result['formatted_address']
-                                # Look for common patterns like "City, State" or "City, State ZIP"
-                                import re
-                                match = re.search(r'([^,]+),\s*([A-Z]{2})', formatted_address)
-                                if match:
-                                    return f"{match.group(1).strip()}, {match.group(2)}"
-                                else:
-                                    return formatted_address
-                        
-                        break
-                    current_distance += step_distance
+            location_name = _locate_on_segment(pickup_location, dropoff_location, distance_miles - start_to_pickup_miles)
         
-        # Fallback if API calls fail
-        return f"Location at {distance_miles:.1f} miles"
+        # Fallback if the target lies beyond the route
+        return location_name or f"Location at {distance_miles:.1f} miles"
             
-    except Exception as e:
-        print(f"Error getting location name: {e}")
+    except (requests.RequestException, ValueError) as e:
+        logger.warning("Error getting location name: %s", e)
         return f"Location at {distance_miles:.1f} miles"
 
 
+def _boundary_cache_keys(boundary_miles, routes, start_location, pickup_location, dropoff_location, total_distance_miles, start_to_pickup_miles):
+    """
+    Django cache keys of the geocoding responses get_location_name_from_route will
+    need for boundary_miles, so they can be read before the lookups fan out. routes
+    maps (origin, destination) to the legs' already-fetched route steps; boundaries
+    on a leg that couldn't be fetched are skipped.
+    """
+    cache_keys = set()
+    for distance_miles in boundary_miles:
+        if distance_miles <= 0:
+            cache_keys.add(_gmaps_cache_key(_GEOCODE_URL, {'address': start_location}))
+        elif distance_miles >= total_distance_miles:
+            cache_keys.add(_gmaps_cache_key(_GEOCODE_URL, {'address': dropoff_location}))
+        else:
+            if distance_miles <= start_to_pickup_miles:
+                leg, leg_miles = (start_location, pickup_location), distance_miles
+            else:
+                leg, leg_miles = (pickup_location, dropoff_location), distance_miles - start_to_pickup_miles
+            if leg not in routes:
+                continue
+            cumulative, end_points = routes[leg]
+            idx = bisect.bisect_left(cumulative, leg_miles * _METERS_PER_MILE)
+            if idx < len(cumulative):
+                lat, lng = end_points[idx]
+                cache_keys.add(_gmaps_cache_key(_GEOCODE_URL, {'latlng': f"{lat},{lng}"}))
+    return cache_keys
+
+
+def plan_trip(trip, data):
+    """
+    Plan an unsaved trip from the create request data: work out the HOS schedule,
+    fill in trip.calculated_route_json and return the trip's unsaved LogEntry objects.
+    Touches no database rows, so callers decide how and when to persist the result.
+    """
+    # Inputs optionally provided by frontend for more accurate planning
+    duration_seconds = int(data.get("duration_seconds") or data.get("durationSeconds") or 0)
+    distance_meters = int(data.get("distance_meters") or data.get("distanceMeters") or 0)
+    start_date_iso = data.get("start_date_iso") or data.get("startDateISO") or date.today().isoformat()
+    start_time_local = (data.get("start_time_local") or "08:00").strip()
+
+    # Derive approximate values if missing
+    if distance_meters and not duration_seconds:
+        # assume 55 mph average
+        miles = distance_meters * _MILES_PER_METER
+        hours = miles * _INV_DRIVING_SPEED
+        duration_seconds = int(hours * 3600)
+    if duration_seconds and not distance_meters:
+        # assume 55 mph average
+        miles = (duration_seconds / 3600) * _DRIVING_SPEED_MPH
+        distance_meters = int(miles * _METERS_PER_MILE)
+
+    # Calculate all distances using Google Maps API
+    # Expect GOOGLE_MAPS_API_KEY to be set in environment (see README.md)
+    
+    # Get exact distances for all segments
+    start_to_pickup_miles = 0
+    pickup_to_dropoff_miles = 0
+    total_distance_miles = 0
+    
+    if trip.pickup_location and trip.pickup_location.strip():
+        start_to_pickup_miles, pickup_to_dropoff_miles = get_pickup_distances_batch([
+            (trip.start_location, trip.pickup_location),
+            (trip.pickup_location, trip.dropoff_location),
+        ])
+        total_distance_miles = start_to_pickup_miles + pickup_to_dropoff_miles
+        logger.debug("Distance breakdown:")
+        logger.debug("  Start → Pickup: %.1f miles", start_to_pickup_miles)
+        logger.debug("  Pickup → Dropoff: %.1f miles", pickup_to_dropoff_miles)
+        logger.debug("  Total distance: %.1f miles", total_distance_miles)
+    else:
+        # No pickup location, use direct distance
+        total_distance_miles = distance_meters * _MILES_PER_METER
+        logger.debug("Direct distance: %.1f miles", total_distance_miles)
+    
+    # Calculate pure driving hours based on actual distances (55 mph average)
+    pure_driving_hours = total_distance_miles * _INV_DRIVING_SPEED
+    pure_driving_seconds = int(pure_driving_hours * 3600)
+    logger.debug("Pure driving time: %.1f hours", pure_driving_hours)
+
+    # HOS parameters (simplified)
+    is_property = trip.is_property_carrying
+    max_drive_per_day_hours = 8.75 if is_property else 8.75  # 70/8 cycle = 8.75 hours per day
+    break_after_drive_hours = 8 if is_property else 8  # both categories have 30-min after 8h driving
+    off_duty_min_hours = 10 if is_property else 8
+    max_on_duty_window_hours = 14 if is_property else 14
+    service_minutes = trip.service_time_minutes
+    
+    # Define constants for the step-by-step calculation
+    daily_work_time = 8.75  # hours
+    refuel_stop_time = 0.25  # hours (15 minutes)
+    loading_stop_time = 1.0  # hours (pickup/dropoff)
+    daily_start_time = 8.0  # 8:00 AM
+    
+    # Calculate fuel stops every 1000 miles from start
+    fuel_interval_miles = 1000  # Fixed at 1000 miles
+    fuel_stop_seconds_each = 15 * 60  # 15 minutes each
+    
+    # Calculate fuel stops based on total distance
+    estimated_fuel_stops = floor(total_distance_miles / fuel_interval_miles)
+    fuel_stop_seconds_total = estimated_fuel_stops * fuel_stop_seconds_each
+    
+    # Identify milestones, generated in ascending distance order
+    milestones = []
+    
+    # Add fuel stops at 1000, 2000, 3000, etc.
+    for i in range(1, estimated_fuel_stops + 1):
+        fuel_distance = i * fuel_interval_miles
+        if fuel_distance < total_distance_miles:
+            milestones.append(Milestone("fuel", fuel_distance, refuel_stop_time))
+    
+    # Slot the pickup in among the fuel stops, ahead of any fuel stop at the same mile
+    if start_to_pickup_miles > 0:
+        bisect.insort_left(
+            milestones,
+            Milestone("pickup", start_to_pickup_miles, loading_stop_time),
+            key=lambda x: x.distance,
+        )
+    
+    # Add dropoff milestone; every other milestone lies at or before it
+    milestones.append(Milestone("dropoff", total_distance_miles, loading_stop_time))
+    logger.debug("Milestones: %s", milestones)
+    
+    # Calculate service time (pickup + dropoff)
+    service_time_seconds = (service_minutes * 60) * 2  # pickup + dropoff
+    
+    logger.debug("Fuel stops: %s stops every %s miles", estimated_fuel_stops, fuel_interval_miles)
+    logger.debug("Service time: %.0f minutes (pickup + dropoff)", service_time_seconds / 60)
+    logger.debug("Total additional time: %.0f minutes", (fuel_stop_seconds_total + service_time_seconds) / 60)
+    
+    # Build segments across days
+    # Strategy: For each day, include service times (pickup on day 1, drop-off on last day),
+    # schedule 30-min break after 8h driving, keep within 14h duty window, then 10h OFF.
+    remaining_drive_seconds = pure_driving_seconds
+    # Build start datetime with provided local HH:MM (treated as naive)
+    try:
+        hh, mm = [int(x) for x in start_time_local.split(":", 1)]
+    except Exception:
+        hh, mm = 8, 0
+    d0 = datetime.fromisoformat(start_date_iso)
+    start_dt = datetime(d0.year, d0.month, d0.day, hh, mm)
+    
+    entries, days = schedule_days(
+        milestones, total_distance_miles, daily_work_time,
+        trip.pickup_location, trip.dropoff_location,
+    )
+    # The day count is known now, so every calendar date is computed once up front.
+    # The last day can end the trip before its progress is recorded, so count from the entries.
+    first_day = start_dt.date()
+    n_days = entries[-1][0] + 1 if entries else 0
+    day_dates = [first_day + timedelta(days=i) for i in range(n_days)]
+    # Model instances are only built here, once the schedule is complete
+    segments = [
+        LogEntry(
+            trip=trip,
+            log_sheet_date=day_dates[day_index],
+            duty_status=duty_status,
+            start_time=_CLOCK_TIMES[start],
+            end_time=_CLOCK_TIMES[end],
+            start_location_text=location_text,
+            end_location_text=location_text,
+            remarks=remarks,
+        )
+        for day_index, duty_status, start, end, location_text, remarks in entries
+    ]
+
+    # Resolve day boundary names concurrently; each lookup is independent.
+    # Day N starts where day N-1 ended, so one lookup per boundary suffices.
+    boundary_miles = [0] + [end_mile for _, _, end_mile in days]
+    start_location, pickup_location, dropoff_location = trip.start_location, trip.pickup_location, trip.dropoff_location
+    routes = {}
+    if GOOGLE_MAPS_API_KEY and pickup_location:
+        # Fetch both legs' routes concurrently up front so the lookups below share
+        # them instead of several threads requesting the same Directions route
+        legs = ((start_location, pickup_location), (pickup_location, dropoff_location))
+        with _gmaps_pool(2, [
+            _gmaps_cache_key(_DIRECTIONS_URL, {'origin': origin, 'destination': destination})
+            for origin, destination in legs
+        ]) as executor:
+            futures = {leg: executor.submit(_get_route_steps, *leg) for leg in legs}
+        routes = {leg: future.result() for leg, future in futures.items() if future.exception() is None}
+    cache_keys = _boundary_cache_keys(
+        boundary_miles, routes, start_location, pickup_location, dropoff_location,
+        total_distance_miles, start_to_pickup_miles,
+    ) if GOOGLE_MAPS_API_KEY else ()
+    with _gmaps_pool(8, cache_keys) as executor:
+        boundary_names = list(executor.map(
+            lambda miles: get_location_name_from_route(
+                miles, start_location, pickup_location, dropoff_location,
+                total_distance_miles, start_to_pickup_miles,
+            ),
+            boundary_miles,
+        ))
+    # Build the per-day JSON rows in one pass now that every name is known
+    daily_progress = [
+        {
+            "date": day_dates[i].isoformat(),
+            "start_location": boundary_names[i],
+            "end_location": boundary_names[i + 1],
+            "daily_distance": daily_distance,
+            "cumulative_distance": cumulative_distance,
+            "driving_hours": daily_distance * _INV_DRIVING_SPEED,
+        }
+        for i, (daily_distance, cumulative_distance, _) in enumerate(days)
+    ]
+
+    # Summarize
+    hours = round(duration_seconds / 3600)
+    miles = round(total_distance_miles)
+    arrival_dt = start_dt + timedelta(seconds=duration_seconds)
+    trip.calculated_route_json = {
+        "summary": {
+            "distance": f"{miles} mi",
+            "duration": f"{hours}h",
+            "stops": estimated_fuel_stops,
+            "arrival": arrival_dt.isoformat(),
+        },
+        "daily_progress": daily_progress
+    }
+
+    return segments
+
+
 class TripViewSet(viewsets.ModelViewSet):
     queryset = Trip.objects.all().order_by("-created_at")
     serializer_class = TripSerializer
 
+    def get_queryset(self):
+        if self.action == "logsheets":
+            # Only the trip's existence is checked; its entries are read as plain rows
+            return super().get_queryset().only("id")
+        # Fetch every trip's log entries in one ordered query instead of one per trip
+        log_entries = LogEntry.objects.order_by("log_sheet_date", "start_time")
+        queryset = super().get_queryset().prefetch_related(
+            Prefetch("log_entries", queryset=log_entries)
+        )
+        if self.action == "list":
+            # The route JSON is only returned by retrieve/create; skip decoding it for listings
+            queryset = queryset.defer("calculated_route_json")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return TripListSerializer
+        return super().get_serializer_class()
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        trip: Trip = serializer.save()
-
-        # Inputs optionally provided by frontend for more accurate planning
-        duration_seconds = int(request.data.get("duration_seconds") or request.data.get("durationSeconds") or 0)
-        distance_meters = int(request.data.get("distance_meters") or request.data.get("distanceMeters") or 0)
-        start_date_iso = request.data.get("start_date_iso") or request.data.get("startDateISO") or date.today().isoformat()
-        start_time_local = (request.data.get("start_time_local") or "08:00").strip()
-
-        # Derive approximate values if missing
-        if distance_meters and not duration_seconds:
-            # assume 55 mph average
-            miles = distance_meters * 0.000621371
-            hours = miles / 55.0
-            duration_seconds = int(hours * 3600)
-        if duration_seconds and not distance_meters:
-            # assume 55 mph average
-            miles = (duration_seconds / 3600) * 55.0
-            distance_meters = int(miles / 0.000621371)
-
-        # Calculate all distances using Google Maps API
-        # Expect GOOGLE_MAPS_API_KEY to be set in environment (see README.md)
-        
-        # Get exact distances for all segments
-        start_to_pickup_miles = 0
-        pickup_to_dropoff_miles = 0
-        total_distance_miles = 0
-        
-        if trip.pickup_location and trip.pickup_location.strip():
-            start_to_pickup_miles = get_pickup_distance_miles(trip.start_location, trip.pickup_location)
-            pickup_to_dropoff_miles = get_pickup_distance_miles(trip.pickup_location, trip.dropoff_location)
-            total_distance_miles = start_to_pickup_miles + pickup_to_dropoff_miles
-            print(f"Distance breakdown:")
-            print(f"  Start → Pickup: {start_to_pickup_miles:.1f} miles")
-            print(f"  Pickup → Dropoff: {pickup_to_dropoff_miles:.1f} miles")
-            print(f"  Total distance: {total_distance_miles:.1f} miles")
-        else:
-            # No pickup location, use direct distance
-            total_distance_miles = distance_meters * 0.000621371
-            print(f"Direct distance: {total_distance_miles:.1f} miles")
-        
-        # Calculate pure driving hours based on actual distances (55 mph average)
-        pure_driving_hours = total_distance_miles / 55.0
-        pure_driving_seconds = int(pure_driving_hours * 3600)
-        print(f"Pure driving time: {pure_driving_hours:.1f} hours")
-
-        # HOS parameters (simplified)
-        is_property = trip.is_property_carrying
-        max_drive_per_day_hours = 8.75 if is_property else 8.75  # 70/8 cycle = 8.75 hours per day
-        break_after_drive_hours = 8 if is_property else 8  # both categories have 30-min after 8h driving
-        off_duty_min_hours = 10 if is_property else 8
-        max_on_duty_window_hours = 14 if is_property else 14
-        service_minutes = trip.service_time_minutes
-        
-        # Define constants for the step-by-step calculation
-        daily_work_time = 8.75  # hours
-        driving_speed = 55  # mph
-        refuel_stop_time = 0.25  # hours (15 minutes)
-        loading_stop_time = 1.0  # hours (pickup/dropoff)
-        daily_start_time = 8.0  # 8:00 AM
-        
-        # Calculate fuel stops every 1000 miles from start
-        fuel_interval_miles = 1000  # Fixed at 1000 miles
-        fuel_stop_seconds_each = 15 * 60  # 15 minutes each
-        
-        # Calculate fuel stops based on total distance
-        estimated_fuel_stops = floor(total_distance_miles / fuel_interval_miles)
-        fuel_stop_seconds_total = estimated_fuel_stops * fuel_stop_seconds_each
-        
-        # Identify milestones
-        milestones = []
-        if start_to_pickup_miles > 0:
-            milestones.append({"type": "pickup", "distance": start_to_pickup_miles, "time": loading_stop_time})
-        
-        # Add fuel stops at 1000, 2000, 3000, etc.
-        for i in range(1, estimated_fuel_stops + 1):
-            fuel_distance = i * fuel_interval_miles
-            if fuel_distance < total_distance_miles:
-                milestones.append({"type": "fuel", "distance": fuel_distance, "time": refuel_stop_time})
-        
-        # Add dropoff milestone
-        milestones.append({"type": "dropoff", "distance": total_distance_miles, "time": loading_stop_time})
-        
-        # Sort milestones by distance
-        milestones.sort(key=lambda x: x["distance"])
-        print(f"Milestones: {milestones}")
-        
-        # Calculate service time (pickup + dropoff)
-        service_time_seconds = (service_minutes * 60) * 2  # pickup + dropoff
-        
-        print(f"Fuel stops: {estimated_fuel_stops} stops every {fuel_interval_miles} miles")
-        print(f"Service time: {service_time_seconds/60:.0f} minutes (pickup + dropoff)")
-        print(f"Total additional time: {(fuel_stop_seconds_total + service_time_seconds)/60:.0f} minutes")
-        
-        # Build segments across days
-        # Strategy: For each day, include service times (pickup on day 1, drop-off on last day),
-        # schedule 30-min break after 8h driving, keep within 14h duty window, then 10h OFF.
-        remaining_drive_seconds = pure_driving_seconds
-        segments: list[LogEntry] = []
-        # Build start datetime with provided local HH:MM (treated as naive)
-        try:
-            hh, mm = [int(x) for x in start_time_local.split(":", 1)]
-        except Exception:
-            hh, mm = 8, 0
-        d0 = datetime.fromisoformat(start_date_iso)
-        start_dt = datetime(d0.year, d0.month, d0.day, hh, mm)
-        day_cursor = datetime(start_dt.year, start_dt.month, start_dt.day)
-        fuel_stops_remaining = estimated_fuel_stops
-        
-        # Track daily progress for multi-day sheets
-        daily_progress = []
-        # Get city, state format for start location
-        start_location_name = get_location_name_from_route(0, trip.start_location, trip.pickup_location, trip.dropoff_location, total_distance_miles)
-        current_location = start_location_name
-        total_distance_covered = 0
-        day_index = 0  # Track current day index
-        cumulative_distance = 0  # Track total distance across all days
-        milestone_index = 0  # Track which milestone we're working towards
-        
-        # Step-by-step daily calculation
-        while total_distance_covered < total_distance_miles:
-            # Simple check: if we've reached the total distance, stop creating new days
-            if total_distance_covered >= total_distance_miles:
-                break
-                
-            day_start = day_cursor
-            day_end = day_start + timedelta(days=1)
-            
-            # Start each day at midnight, add OFF-duty time until 8:00 AM
-            day_start_midnight = datetime(day_start.year, day_start.month, day_start.day, 0, 0)
-            duty_window_start = datetime(day_start.year, day_start.month, day_start.day, 8, 0)
-            
-            # Add OFF-duty time from midnight to 8:00 AM for ALL days
-            segments.append(LogEntry(
-                trip=trip,
-                log_sheet_date=day_start.date(),
-                duty_status="OFF",
-                start_time=time(0, 0),
-                end_time=time(8, 0),
-            ))
-            print(f"Day {day_index + 1}: OFF-duty from 00:00 to 08:00")
-            
-            t = duty_window_start
-            
-            # Daily work time budget
-            remaining_time_today = daily_work_time
-            daily_distance_covered = 0
-            
-            print(f"Day {day_index + 1}: Starting driving at {t.strftime('%H:%M')} with {remaining_time_today:.2f} hours available")
-            print(f"Current cumulative distance: {total_distance_covered:.1f} miles")
-            
-            # Process milestones for this day
-            while remaining_time_today > 0 and milestone_index < len(milestones):
-                milestone = milestones[milestone_index]
-                distance_to_milestone = milestone["distance"] - total_distance_covered
-                
-                if distance_to_milestone <= 0:
-                    # Already passed this milestone, skip it
-                    milestone_index += 1
-                    continue
-                
-                # Calculate time needed to reach this milestone
-                drive_time_to_milestone = distance_to_milestone / driving_speed
-                total_time_for_milestone = drive_time_to_milestone + milestone["time"]
-                
-                print(f"  Milestone {milestone_index + 1}: {milestone['type']} at {milestone['distance']} miles")
-                print(f"    Distance to milestone: {distance_to_milestone:.1f} miles")
-                print(f"    Drive time: {drive_time_to_milestone:.2f} hours")
-                print(f"    Stop time: {milestone['time']:.2f} hours")
-                print(f"    Total time needed: {total_time_for_milestone:.2f} hours")
-                print(f"    Remaining time today: {remaining_time_today:.2f} hours")
-                
-                if total_time_for_milestone <= remaining_time_today:
-                    # Can complete this milestone today
-                    print(f"    ✓ Can complete milestone today")
-                    
-                    # Drive to milestone
-                    drive_end = t + timedelta(hours=drive_time_to_milestone)
-                    segments.append(LogEntry(
-                        trip=trip,
-                        log_sheet_date=day_start.date(),
-                        duty_status="DR",
-                        start_time=time(t.hour, t.minute),
-                        end_time=time(drive_end.hour, drive_end.minute),
-                    ))
-                    t = drive_end
-                    daily_distance_covered += distance_to_milestone
-                    total_distance_covered += distance_to_milestone
-                    remaining_time_today -= drive_time_to_milestone
-                    
-                    # Add milestone stop
-                    stop_end = t + timedelta(hours=milestone["time"])
-                    duty_status = "ON" if milestone["type"] in ["pickup", "dropoff"] else "ON"
-                    remarks = f"{milestone['type'].title()} service" if milestone["type"] in ["pickup", "dropoff"] else f"Fuel stop at {milestone['distance']} miles"
-                    
-                    segments.append(LogEntry(
-                        trip=trip,
-                        log_sheet_date=day_start.date(),
-                        duty_status=duty_status,
-                        start_time=time(t.hour, t.minute),
-                        end_time=time(stop_end.hour, stop_end.minute),
-                        start_location_text=trip.pickup_location if milestone["type"] == "pickup" else "",
-                        end_location_text=trip.pickup_location if milestone["type"] == "pickup" else "",
-                        distance_driven=0,
-                        remarks=remarks
-                    ))
-                    t = stop_end
-                    remaining_time_today -= milestone["time"]
-                    
-                    print(f"    Completed at {t.strftime('%H:%M')}")
-                    milestone_index += 1
-
-                    # If the next milestone is at the exact same distance, process it immediately
-                    # This allows pickup and fuel (or any combo) at the same mile to be logged separately
-                    while (
-                        milestone_index < len(milestones)
-                        and abs(milestones[milestone_index]["distance"] - total_distance_covered) < 1e-6
-                        and remaining_time_today > 0
-                    ):
-                        same_milestone = milestones[milestone_index]
-                        print(f"    Processing same-distance milestone: {same_milestone['type']} at {same_milestone['distance']} miles")
-                        if same_milestone["time"] <= remaining_time_today:
-                            same_stop_end = t + timedelta(hours=same_milestone["time"])
-                            same_duty_status = "ON"  # both pickup/dropoff and fuel are ON-duty not driving
-                            same_remarks = (
-                                f"{same_milestone['type'].title()} service" if same_milestone["type"] in ["pickup", "dropoff"]
-                                else f"Fuel stop at {same_milestone['distance']} miles"
-                            )
-                            segments.append(LogEntry(
-                                trip=trip,
-                                log_sheet_date=day_start.date(),
-                                duty_status=same_duty_status,
-                                start_time=time(t.hour, t.minute),
-                                end_time=time(same_stop_end.hour, same_stop_end.minute),
-                                start_location_text=trip.pickup_location if same_milestone["type"] == "pickup" else "",
-                                end_location_text=trip.pickup_location if same_milestone["type"] == "pickup" else "",
-                                distance_driven=0,
-                                remarks=same_remarks
-                            ))
-                            t = same_stop_end
-                            remaining_time_today -= same_milestone["time"]
-                            milestone_index += 1
-                            print(f"    Same-distance milestone completed at {t.strftime('%H:%M')}")
-                        else:
-                            # Not enough time today for this same-distance stop; end day
-                            print(f"    Not enough time for same-distance stop today; deferring")
-                            break
-                    
-                    # If we completed the dropoff milestone, the trip is done
-                    if milestone["type"] == "dropoff":
-                        print(f"    Trip completed! Reached dropoff at {total_distance_covered:.1f} miles")
-                        # Don't add OFF-duty here - let the main loop handle it
-                        
-                        # Store final daily progress
-                        dropoff_location_name = get_location_name_from_route(total_distance_miles, trip.start_location, trip.pickup_location, trip.dropoff_location, total_distance_miles)
-                        daily_progress.append({
-                            "date": day_start.date().isoformat(),
-                            "start_location": current_location,
-                            "end_location": dropoff_location_name,
-                            "daily_distance": daily_distance_covered,
-                            "cumulative_distance": total_distance_covered,
-                            "driving_hours": daily_distance_covered / driving_speed
-                        })
-                        
-                        # Break out of milestone loop
-                        remaining_time_today = 0
-                        total_distance_covered = total_distance_miles  # Set to exact total
-                        break
-                    
-                else:
-                    # Cannot complete milestone today, just drive for remaining time
-                    print(f"    ✗ Cannot complete milestone today, driving for remaining time")
-                    
-                    # Special handling for dropoff milestone - don't exceed total distance
-                    if milestone["type"] == "dropoff":
-                        # Drive only as far as needed to reach dropoff
-                        distance_to_dropoff = milestone["distance"] - total_distance_covered
-                        if distance_to_dropoff > 0:
-                            drive_time_to_dropoff = distance_to_dropoff / driving_speed
-                            if drive_time_to_dropoff <= remaining_time_today:
-                                # Can reach dropoff today
-                                drive_end = t + timedelta(hours=drive_time_to_dropoff)
-                                segments.append(LogEntry(
-                                    trip=trip,
-                                    log_sheet_date=day_start.date(),
-                                    duty_status="DR",
-                                    start_time=time(t.hour, t.minute),
-                                    end_time=time(drive_end.hour, drive_end.minute),
-                                ))
-                                t = drive_end
-                                daily_distance_covered += distance_to_dropoff
-                                total_distance_covered += distance_to_dropoff
-                                remaining_time_today -= drive_time_to_dropoff
-                                
-                                # Add dropoff service
-                                stop_end = t + timedelta(hours=milestone["time"])
-                                segments.append(LogEntry(
-                                    trip=trip,
-                                    log_sheet_date=day_start.date(),
-                                    duty_status="ON",
-                                    start_time=time(t.hour, t.minute),
-                                    end_time=time(stop_end.hour, stop_end.minute),
-                                    start_location_text=trip.dropoff_location,
-                                    end_location_text=trip.dropoff_location,
-                                    distance_driven=0,
-                                    remarks="Dropoff service"
-                                ))
-                                t = stop_end
-                                remaining_time_today -= milestone["time"]
-                                
-                                print(f"    ✓ Reached dropoff at {total_distance_covered:.1f} miles")
-                                print(f"    Trip completed! Reached dropoff at {total_distance_covered:.1f} miles")
-                                
-                                # Store final daily progress
-                                dropoff_location_name = get_location_name_from_route(total_distance_miles, trip.start_location, trip.pickup_location, trip.dropoff_location, total_distance_miles)
-                                daily_progress.append({
-                                    "date": day_start.date().isoformat(),
-                                    "start_location": current_location,
-                                    "end_location": dropoff_location_name,
-                                    "daily_distance": daily_distance_covered,
-                                    "cumulative_distance": total_distance_covered,
-                                    "driving_hours": daily_distance_covered / driving_speed
-                                })
-                                
-                                # Break out of milestone loop
-                                # Don't set remaining_time_today = 0, let main loop handle OFF-duty
-                                total_distance_covered = total_distance_miles  # Set to exact total
-                                break
-                            else:
-                                # Cannot reach dropoff today, drive for remaining time
-                                distance_this_time = remaining_time_today * driving_speed
-                                drive_end = t + timedelta(hours=remaining_time_today)
-                                segments.append(LogEntry(
-                                    trip=trip,
-                                    log_sheet_date=day_start.date(),
-                                    duty_status="DR",
-                                    start_time=time(t.hour, t.minute),
-                                    end_time=time(drive_end.hour, drive_end.minute),
-                                ))
-                                t = drive_end
-                                daily_distance_covered += distance_this_time
-                                total_distance_covered += distance_this_time
-                                remaining_time_today = 0
-                                print(f"  Drove for remaining {remaining_time_today:.2f} hours: {distance_this_time:.1f} miles")
-                                break # End day
-                        else:
-                            # Already at or past dropoff
-                            print(f"    Already at dropoff location")
-                            break
-                    else:
-                        # For other milestones, drive for remaining time
-                        distance_this_time = remaining_time_today * driving_speed
-                        drive_end = t + timedelta(hours=remaining_time_today)
-                        segments.append(LogEntry(
-                            trip=trip,
-                            log_sheet_date=day_start.date(),
-                            duty_status="DR",
-                            start_time=time(t.hour, t.minute),
-                            end_time=time(drive_end.hour, drive_end.minute),
-                        ))
-                        t = drive_end
-                        daily_distance_covered += distance_this_time
-                        total_distance_covered += distance_this_time
-                        remaining_time_today = 0
-                        print(f"  Drove for remaining {remaining_time_today:.2f} hours: {distance_this_time:.1f} miles")
-                        break # End day
-            
-            # Check if trip is completed after milestone processing
-            if total_distance_covered >= total_distance_miles:
-                print(f"Trip completed in milestone loop! Total distance: {total_distance_covered:.1f} miles")
-                # Don't break here, let main loop add OFF-duty entry first
-            
-            # If we have remaining time and no more milestones, drive for remaining time
-            if remaining_time_today > 0 and milestone_index >= len(milestones):
-                # Drive for remaining time
-                distance_this_time = remaining_time_today * driving_speed
-                drive_end = t + timedelta(hours=remaining_time_today)
-                segments.append(LogEntry(
-                    trip=trip,
-                    log_sheet_date=day_start.date(),
-                    duty_status="DR",
-                    start_time=time(t.hour, t.minute),
-                    end_time=time(drive_end.hour, drive_end.minute),
-                ))
-                t = drive_end
-                daily_distance_covered += distance_this_time
-                total_distance_covered += distance_this_time
-                remaining_time_today = 0
-                print(f"  Drove for remaining {remaining_time_today:.2f} hours: {distance_this_time:.1f} miles")
-            
-            # Add off-duty time for remainder of day
-            off_end = datetime(day_start.year, day_start.month, day_start.day, 23, 59)
-            segments.append(LogEntry(
-                trip=trip,
-                log_sheet_date=day_start.date(),
-                duty_status="OFF",
-                start_time=time(t.hour, t.minute),
-                end_time=time(off_end.hour, off_end.minute),
-            ))
-            
-            # Check if trip is completed after adding OFF-duty entry
-            if total_distance_covered >= total_distance_miles:
-                print(f"Trip completed after OFF-duty entry! Total distance: {total_distance_covered:.1f} miles")
-                break
-            
-            print(f"Day {day_index + 1} completed: {daily_distance_covered:.1f} miles, cumulative: {total_distance_covered:.1f} miles")
-            
-            # Store daily progress
-            end_location_name = get_location_name_from_route(
-                total_distance_covered, 
-                trip.start_location, 
-                trip.pickup_location, 
-                trip.dropoff_location, 
-                total_distance_miles
-            )
-            daily_progress.append({
-                "date": day_start.date().isoformat(),
-                "start_location": current_location,
-                "end_location": end_location_name,
-                "daily_distance": daily_distance_covered,
-                "cumulative_distance": total_distance_covered,
-                "driving_hours": daily_distance_covered / driving_speed
-            })
-            
-            # Update current_location for the next day's start_location
-            current_location = end_location_name
-            
-            # Check if trip is completed
-            if total_distance_covered >= total_distance_miles:
-                print(f"Trip completed! Total distance: {total_distance_covered:.1f} miles")
-                break
-                
-            # Advance to next day
-            day_cursor = day_cursor + timedelta(days=1)
-            day_index += 1
-
-        # Persist entries
-        print(f"Creating {len(segments)} log entries")
-        for i, segment in enumerate(segments):
-            print(f"Entry {i+1}: {segment.duty_status} {segment.start_time}-{segment.end_time} {segment.remarks}")
-        LogEntry.objects.bulk_create(segments)
-
-        # Summarize
-        hours = round(duration_seconds / 3600)
-        miles = round(total_distance_miles)
-        arrival_dt = start_dt + timedelta(seconds=duration_seconds)
-        trip.calculated_route_json = {
-            "summary": {
-                "distance": f"{miles} mi",
-                "duration": f"{hours}h",
-                "stops": estimated_fuel_stops,
-                "arrival": arrival_dt.isoformat(),
-            },
-            "daily_progress": daily_progress
-        }
-        trip.save(update_fields=["calculated_route_json"])
+        # Built unsaved; the trip and its log entries are written together at the end
+        trip = Trip(**serializer.validated_data)
+
+        segments = plan_trip(trip, request.data)
+
+        # Persist the trip and its entries in one transaction, opened only after every
+        # Google Maps call has finished so no connection sits idle on network I/O
+        logger.debug("Creating %s log entries", len(segments))
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, segment in enumerate(segments):
+                logger.debug("Entry %s: %s %s-%s %s", i + 1, segment.duty_status, segment.start_time, segment.end_time, segment.remarks)
+        with transaction.atomic():
+            trip.save()
+            LogEntry.objects.bulk_create(segments, batch_size=_LOG_ENTRY_BATCH_SIZE)
 
-        headers = self.get_success_headers(serializer.data)
-        return Response(TripSerializer(trip).data, status=status.HTTP_201_CREATED, headers=headers)
+        data = TripSerializer(trip, context={"log_entries": segments}).data
+        headers = self.get_success_headers(data)
+        return Response(data, status=status.HTTP_201_CREATED, headers=headers)
 
     @action(detail=True, methods=["get"])
     def logsheets(self, request, pk=None):
         trip = self.get_object()
-        entries = trip.log_entries.all()
-        return Response(LogEntrySerializer(entries, many=True).data)
+        # Same fields as LogEntrySerializer, read straight into dicts; the renderer
+        # encodes the dates and times as-is without a per-row serializer pass
+        entries = trip.log_entries.order_by("log_sheet_date", "start_time").values(*LogEntrySerializer.Meta.fields)
+        return Response(list(entries))
 
 
 class LogEntryViewSet(viewsets.ModelViewSet):